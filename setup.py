@@ -23,6 +23,7 @@ setup(
     include_package_data=True,
     test_suite='nose.collector',
     install_requires=[
+        'numpy',
         'h5py==2.9.0'
     ],
     tests_require=[
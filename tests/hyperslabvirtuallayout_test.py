@@ -0,0 +1,52 @@
+import unittest
+from mock import MagicMock, patch
+
+from vdsgen.hyperslabvirtuallayout import HyperslabVirtualLayout
+
+layout_patch_path = "vdsgen.hyperslabvirtuallayout"
+
+
+class HyperslabVirtualLayoutTest(unittest.TestCase):
+
+    @patch(layout_patch_path + ".h5s")
+    @patch(layout_patch_path + ".h5p")
+    def test_init(self, h5p_mock, h5s_mock):
+        layout = HyperslabVirtualLayout((4, 3, 256, 2048), "uint16")
+
+        h5p_mock.create.assert_called_once_with(h5p_mock.DATASET_CREATE)
+        h5s_mock.create_simple.assert_called_once_with((4, 3, 256, 2048))
+        self.assertEqual((1, 1, 1, 1), layout.single_count)
+        self.assertEqual(h5p_mock.create.return_value, layout.dcpl)
+        self.assertEqual(h5s_mock.create_simple.return_value,
+                         layout.virtual_space)
+
+    @patch(layout_patch_path + ".h5s")
+    @patch(layout_patch_path + ".h5p")
+    def test_map_hyperslab(self, h5p_mock, h5s_mock):
+        layout = HyperslabVirtualLayout((4, 3, 256, 2048), "uint16")
+        source_space = MagicMock()
+
+        layout.map_hyperslab((2, 1, 0, 0), (1, 1, 256, 2048),
+                             b"raw.h5", b"data", source_space)
+
+        layout.virtual_space.select_hyperslab.assert_called_once_with(
+            (2, 1, 0, 0), (1, 1, 1, 1), block=(1, 1, 256, 2048))
+        layout.dcpl.set_virtual.assert_called_once_with(
+            layout.virtual_space, b"raw.h5", b"data", source_space)
+
+    @patch(layout_patch_path + ".h5d")
+    @patch(layout_patch_path + ".h5t")
+    @patch(layout_patch_path + ".h5s")
+    @patch(layout_patch_path + ".h5p")
+    def test_make_dataset(self, h5p_mock, h5s_mock, h5t_mock, h5d_mock):
+        layout = HyperslabVirtualLayout((4, 3, 256, 2048), "uint16")
+        parent = MagicMock()
+
+        dataset = layout.make_dataset(parent, "data", fillvalue=-1)
+
+        self.assertEqual([-1], list(
+            layout.dcpl.set_fill_value.call_args[0][0]))
+        h5d_mock.create.assert_called_once_with(
+            parent.id, name=b"data", tid=h5t_mock.py_create.return_value,
+            space=h5s_mock.create_simple.return_value, dcpl=layout.dcpl)
+        self.assertEqual(h5d_mock.create.return_value, dataset)
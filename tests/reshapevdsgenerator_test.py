@@ -5,6 +5,7 @@ from mock import MagicMock, patch, call
 
 from vdsgen import vdsgenerator
 from vdsgen.reshapevdsgenerator import ReshapeVDSGenerator
+from vdsgen.hyperslabvirtuallayout import HyperslabVirtualLayout
 
 vdsgen_patch_path = "vdsgen.reshapevdsgenerator"
 VDSGenerator_patch_path = vdsgen_patch_path + ".VDSGenerator"
@@ -43,10 +44,11 @@ class ReshapeVDSGeneratorInitTest(unittest.TestCase):
 
     @patch(VDSGenerator_patch_path + ".__init__", new=set_files)
     def test_super_called(self):
-        ReshapeVDSGenerator((3, 5, 10), "/test/path", files=["raw.h5"])
+        gen = ReshapeVDSGenerator((3, 5, 10), "/test/path", files=["raw.h5"])
 
         self.super_mock.assert_called_once_with("/test/path", None, ["raw.h5"],
                                                 *[None]*6)
+        self.assertEqual(150, gen.target_frames)
 
 
 class SimpleFunctionsTest(unittest.TestCase):
@@ -68,15 +70,31 @@ class SimpleFunctionsTest(unittest.TestCase):
     @patch(VDSGenerator_patch_path + ".grab_metadata",
            side_effect=[
                dict(frames=(3,), height=256, width=2048, dtype="uint16"),
-               dict(frames=(3,), height=512, width=2048, dtype="uint16")])
-    def test_process_source_datasets_given_mismatched_data(self, grab_mock):
+               dict(frames=(4,), height=256, width=2048, dtype="uint16")])
+    def test_process_source_datasets_sums_frames(self, grab_mock):
         gen = ReshapeVDSGeneratorTester(
             files=["stripe_1.h5", "stripe_2.h5"])
 
-        with self.assertRaises(ValueError):
+        gen.process_source_datasets()
+
+        self.assertEqual(7, gen.total_frames)
+
+    @patch(VDSGenerator_patch_path + ".grab_metadata",
+           side_effect=[
+               dict(frames=(3,), height=256, width=2048, dtype="uint16"),
+               dict(frames=(3,), height=512, width=2048, dtype="uint16"),
+               dict(frames=(3,), height=256, width=2048, dtype="uint16")])
+    def test_process_source_datasets_given_mismatched_data(self, grab_mock):
+        gen = ReshapeVDSGeneratorTester(
+            files=["stripe_1.h5", "stripe_2.h5", "stripe_3.h5"])
+
+        with self.assertRaises(ValueError) as e:
             gen.process_source_datasets()
 
-        grab_mock.assert_has_calls([call("stripe_1.h5"), call("stripe_2.h5")])
+        # Stops at the first mismatched file
+        self.assertEqual([call("stripe_1.h5"), call("stripe_2.h5")],
+                         grab_mock.call_args_list)
+        self.assertEqual("Files have mismatched height", str(e.exception))
 
     file_mock = MagicMock()
 
@@ -86,7 +104,8 @@ class SimpleFunctionsTest(unittest.TestCase):
     def test_create_virtual_layout(self, layout_mock, source_mock, file_mock):
         gen = ReshapeVDSGeneratorTester(
             output_file="/test/path/vds.hdf5",
-            dimensions=(5, 3, 10), alternate=None, periods=[], radices=(30, 10),
+            dimensions=(5, 3, 10), target_frames=150, alternate=None,
+            periods=[],
             target_node="full_frame", source_node="data",
             source_file="raw.h5", name="vds.hdf5")
         source = vdsgenerator.SourceMeta(
@@ -106,7 +125,8 @@ class SimpleFunctionsTest(unittest.TestCase):
     def test_create_virtual_layout_frame_mismatch(self):
         gen = ReshapeVDSGeneratorTester(
             output_file="/test/path/vds.hdf5",
-            dimensions=(5, 3, 10), alternate=None, periods=[], radices=(30, 10),
+            dimensions=(5, 3, 10), target_frames=150, alternate=None,
+            periods=[],
             target_node="full_frame", source_node="data",
             source_file="raw.h5", name="vds.hdf5")
         source = vdsgenerator.SourceMeta(
@@ -114,3 +134,61 @@ class SimpleFunctionsTest(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             gen.create_virtual_layout(source)
+
+    @patch(vdsgen_patch_path + ".h5s")
+    @patch(vdsgen_patch_path + ".HyperslabVirtualLayout")
+    def test_create_alternating_virtual_layout(self, layout_mock, h5s_mock):
+        gen = ReshapeVDSGeneratorTester(
+            dimensions=(2, 3), target_frames=6, alternate=(False, True),
+            source_file="/test/path/raw.h5", source_node="data",
+            name="vds.hdf5", logger=MagicMock())
+        source_space = h5s_mock.create_simple.return_value
+
+        layout = gen.create_alternating_virtual_layout(
+            (2, 3, 256, 2048), (6, 256, 2048), "uint16")
+
+        layout_mock.assert_called_once_with((2, 3, 256, 2048), "uint16")
+        self.assertEqual(layout_mock.return_value, layout)
+        # Mappings are made in VDS order
+        source_space.select_hyperslab.assert_has_calls(
+            [call((idx, 0, 0), (1, 1, 1), block=(1, 256, 2048))
+             for idx in [0, 1, 2, 5, 4, 3]])
+        layout.map_hyperslab.assert_has_calls(
+            [call((row, column, 0, 0), (1, 1, 256, 2048),
+                  b"/test/path/raw.h5", b"data", source_space)
+             for row in range(2) for column in range(3)])
+
+    def test_create_virtual_dataset_hyperslab_layout(self):
+        gen = ReshapeVDSGeneratorTester(target_node="full_frame",
+                                        fill_value=-1)
+        vds_file = MagicMock()
+        layout = MagicMock(spec=HyperslabVirtualLayout)
+
+        gen.create_virtual_dataset(vds_file, layout)
+
+        layout.make_dataset.assert_called_once_with(
+            vds_file, name="full_frame", fillvalue=-1)
+        vds_file.create_virtual_dataset.assert_not_called()
+
+    def test_create_virtual_dataset_virtual_layout(self):
+        gen = ReshapeVDSGeneratorTester(target_node="full_frame",
+                                        fill_value=-1)
+        vds_file = MagicMock()
+        layout = MagicMock()
+
+        gen.create_virtual_dataset(vds_file, layout)
+
+        vds_file.create_virtual_dataset.assert_called_once_with(
+            "full_frame", layout, fillvalue=-1)
+
+    def test_calculate_all_axis_indices(self):
+        gen = ReshapeVDSGeneratorTester(
+            dimensions=(4, 3), target_frames=12, alternate=(False, True))
+
+        axis_indices = gen.calculate_all_axis_indices((4, 3, 256, 2048))
+
+        self.assertEqual((2, 12), axis_indices.shape)
+        self.assertEqual([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3],
+                         list(axis_indices[0]))
+        self.assertEqual([0, 1, 2, 2, 1, 0, 0, 1, 2, 2, 1, 0],
+                         list(axis_indices[1]))
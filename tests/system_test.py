@@ -294,6 +294,29 @@ class SystemTest(TestCase):
                 vds_dataset[:, :, 0, 0].flatten()
             )
 
+    def test_reshape_alternate_nested_node(self):
+        # Write a raw file with 12 2x3 frames, each filled with its index
+        with h5.File("raw_0.h5", "w") as raw_file:
+            raw_file["data"] = np.arange(12, dtype="float32").reshape(
+                (12, 1, 1)) * np.ones((1, 2, 3), dtype="float32")
+        print("Creating VDS...")
+        gen = ReshapeVDSGenerator(
+            shape=(4, 3), path="./", files=["raw_0.h5"],
+            output="reshaped.h5", target_node="entry/data", log_level=1,
+            alternate=(False, True)
+        )
+        gen.generate_vds()
+
+        with h5.File("reshaped.h5", mode="r") as h5_file:
+            vds_dataset = h5_file["entry/data"]
+
+            print("Verifying dataset...")
+            self.assertEqual((4, 3, 2, 3), vds_dataset.shape)
+            np.testing.assert_array_equal(
+                [[0., 1., 2.], [5., 4., 3.], [6., 7., 8.], [11., 10., 9.]],
+                vds_dataset[:, :, 1, 2]
+            )
+
     def test_reshape_empty(self):
         FRAMES = 60
         SHAPE = (5, 4, 3)
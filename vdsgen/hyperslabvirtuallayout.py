@@ -0,0 +1,70 @@
+"""A class to build a Virtual Dataset layout with the low level HDF5 API."""
+
+import numpy as np
+from h5py import h5d, h5p, h5s, h5t
+
+
+class HyperslabVirtualLayout(object):
+
+    """A VirtualLayout mapping source hyperslabs directly onto a DCPL.
+
+    Mappings are added with dcpl.set_virtual, without creating a
+    VirtualSource or parsing a slice selection for every mapping. The dataset
+    must be created with make_dataset; h5py.Group.create_virtual_dataset only
+    accepts an h5py.VirtualLayout.
+
+    """
+
+    def __init__(self, shape, dtype):
+        """
+        Args:
+            shape(tuple(int)): Shape of virtual dataset
+            dtype(str): Data type of virtual dataset
+
+        """
+        self.shape = shape
+        self.dtype = dtype
+
+        self.dcpl = h5p.create(h5p.DATASET_CREATE)
+        self.dcpl.set_layout(h5d.VIRTUAL)
+        self.virtual_space = h5s.create_simple(shape)
+        self.single_count = (1,) * len(shape)
+
+    def map_hyperslab(self, start, block, source_file, source_node,
+                      source_space):
+        """Map the selection of a source dataspace to a block of the VDS.
+
+        Args:
+            start(tuple(int)): Index of first element of block in VDS
+            block(tuple(int)): Shape of block in VDS
+            source_file(bytes): Path to source file
+            source_node(bytes): Data node in source file
+            source_space(h5py.h5s.SpaceID): Source dataspace with the
+                hyperslab to map selected
+
+        """
+        self.virtual_space.select_hyperslab(start, self.single_count,
+                                            block=block)
+        # set_virtual copies the selections, so the dataspaces can be reused
+        self.dcpl.set_virtual(self.virtual_space, source_file, source_node,
+                              source_space)
+
+    def make_dataset(self, parent, name, fillvalue=None):
+        """Create the virtual dataset.
+
+        Args:
+            parent(h5py.Group): Group to create dataset in
+            name(str): Name of dataset
+            fillvalue: Fill value for unmapped regions
+
+        Returns:
+            h5py.h5d.DatasetID: Low level identifier of new dataset
+
+        """
+        if fillvalue is not None:
+            self.dcpl.set_fill_value(np.array(fillvalue, ndmin=1))
+
+        tid = h5t.py_create(np.dtype(self.dtype), logical=1)
+        return h5d.create(parent.id, name=name.encode("utf-8"), tid=tid,
+                          space=h5s.create_simple(self.shape),
+                          dcpl=self.dcpl)
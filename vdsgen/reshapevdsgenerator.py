@@ -1,10 +1,15 @@
 """A class to generate an ND Virtual Dataset from a 1D raw dataset."""
 
 import logging
+from functools import reduce
+from operator import mul
 
+import numpy as np
 import h5py as h5
+from h5py import h5s
 
 from .vdsgenerator import VDSGenerator, SourceMeta
+from .hyperslabvirtuallayout import HyperslabVirtualLayout
 
 
 class ReshapeVDSGenerator(VDSGenerator):
@@ -31,6 +36,7 @@ class ReshapeVDSGenerator(VDSGenerator):
         self.periods = []
         self.alternate = alternate
         self.dimensions = shape
+        self.target_frames = self.product(shape)
         self.source_file = self.files[0]  # Reshape only has one raw file
 
     def process_source_datasets(self):
@@ -42,14 +48,20 @@ class ReshapeVDSGenerator(VDSGenerator):
 
         """
         data = self.grab_metadata(self.files[0])
+        attributes = ("height", "width", "dtype")
+        frame_format = tuple(data[attribute] for attribute in attributes)
         self.total_frames = data["frames"][0]
         for dataset in self.files[1:]:
             temp_data = self.grab_metadata(dataset)
+            temp_format = tuple(temp_data[attribute]
+                                for attribute in attributes)
+            if temp_format != frame_format:
+                mismatched = [attribute for attribute, value, temp_value
+                              in zip(attributes, frame_format, temp_format)
+                              if value != temp_value]
+                raise ValueError("Files have mismatched "
+                                 "{}".format(", ".join(mismatched)))
             self.total_frames += temp_data["frames"][0]
-            for attribute, value in data.items():
-                if attribute != "frames" and temp_data[attribute] != value:
-                    raise ValueError("Files have mismatched "
-                                     "{}".format(attribute))
 
         source = SourceMeta(frames=data['frames'],
                             height=data['height'], width=data['width'],
@@ -72,105 +84,139 @@ class ReshapeVDSGenerator(VDSGenerator):
             VirtualLayout: Object describing links between raw data and VDS
 
         """
-        if source_meta.frames[0] != self.product(self.dimensions):
+        if source_meta.frames[0] != self.target_frames:
             raise ValueError(
                 "Length of source frames ({}) does no match target shape "
                 "[{}] ({}))".format(
                     source_meta.frames[0],
                     ", ".join(str(d) for d in self.dimensions),
-                    self.product(self.dimensions))
+                    self.target_frames)
             )
         vds_shape = self.dimensions + (source_meta.height, source_meta.width)
         self.logger.debug("VDS metadata:\n"
                           "  Shape: %s\n", vds_shape)
-        v_layout = h5.VirtualLayout(vds_shape, source_meta.dtype)
 
         source_shape = source_meta.frames + \
             (source_meta.height, source_meta.width)
-        v_source = h5.VirtualSource(
-            self.source_file, name=self.source_node,
-            shape=source_shape, dtype=source_meta.dtype
-        )
 
         if self.alternate is not None:
             v_layout = self.create_alternating_virtual_layout(
-                vds_shape, v_source, v_layout)
+                vds_shape, source_shape, source_meta.dtype)
         else:
+            v_layout = h5.VirtualLayout(vds_shape, source_meta.dtype)
+            v_source = h5.VirtualSource(
+                self.source_file, name=self.source_node,
+                shape=source_shape, dtype=source_meta.dtype
+            )
             v_layout[...] = v_source
 
         return v_layout
 
-    def create_alternating_virtual_layout(self, shape, v_source, v_layout):
-        radices = self.create_mixed_radix_set()
+    def create_virtual_dataset(self, vds_file, virtual_layout):
+        """Create the virtual dataset at the target node.
 
-        # Iterate over total number of row hyperslabs to map to VDS
-        for idx in range(self.product(self.dimensions)):
-            axis_indices = self.calculate_axis_indices(idx, radices, shape)
-            # Hyperslab: Single index for each inner axis,
-            #            Full extent of outermost axis,
-            #            Full slice for height and width
-            vds_hyperslab = tuple(axis_indices +
-                                  [self.FULL_SLICE, self.FULL_SLICE])
-            v_layout[vds_hyperslab] = v_source[idx]
-
-            self.logger.debug(
-                "Mapping %s[%s, ...] to %s[%d, ...].",
-                self.name, ", ".join(str(idx) for idx in axis_indices),
-                self.source_file.split("/")[-1], idx)
+        Args:
+            vds_file(h5py.File): File to create dataset in
+            virtual_layout(VirtualLayout): Object describing links between
+                raw data and VDS
 
-        return v_layout
+        """
+        if isinstance(virtual_layout, HyperslabVirtualLayout):
+            # Group.create_virtual_dataset only accepts an h5py VirtualLayout
+            # in h5py 2.9, so create the dataset directly
+            virtual_layout.make_dataset(vds_file, name=self.target_node,
+                                        fillvalue=self.fill_value)
+        else:
+            super(ReshapeVDSGenerator, self).create_virtual_dataset(
+                vds_file, virtual_layout)
 
-    def create_mixed_radix_set(self):
-        # Create a mixed radix set mapping any 1D index to an ND index
-        # The 1D index is a decimal number and the ND index is the equivalent
-        # representation in the mixed radix numeral system derived from shape
-        # e.g. for shape (5, 3, 10) radices = 30, 10 and 1
-        #   132 -> 412 (30*4 + 10*1 + 1*2) so [132] in 1D -> [4, 1, 2] in 3D
-        radices = [1]  # Smallest radix is always worth 1 in decimal
-        for axis_length in reversed(self.dimensions[1:]):
-            radices.insert(0, radices[0] * axis_length)
-        return tuple(radices)
-
-    @staticmethod
-    def product(iterable):
-        """Calculate product of elements of an iterable.
+    def create_alternating_virtual_layout(self, shape, source_shape, dtype):
+        """Create a layout mapping each raw frame to its alternated position.
 
         Args:
-            iterable: An object capable of returning its members one at a time.
-                Must have at least on element.
+            shape(tuple(int)): Shape of VDS
+            source_shape(tuple(int)): Shape of raw dataset
+            dtype(str): Data type of raw dataset
 
         Returns:
-            int: Product
+            HyperslabVirtualLayout: Object describing links between raw data
+                and VDS
 
         """
-        product = 1
-        for value in iterable:
-            product *= value
-        return product
+        v_layout = HyperslabVirtualLayout(shape, dtype)
+        source_space = h5s.create_simple(source_shape)
+        source_file = self.source_file.encode("utf-8")
+        source_node = self.source_node.encode("utf-8")
+
+        height, width = shape[-2:]
+        frame_block = (1,) * len(self.dimensions) + (height, width)
+        source_block = (1, height, width)
+
+        axis_indices = self.calculate_all_axis_indices(shape)
+        # Map frames in VDS order, so that the mappings are stored in the
+        # order a contiguous read of the VDS will access them
+        frame_order = np.argsort(
+            np.ravel_multi_index(axis_indices, self.dimensions))
+        # Convert to lists of python ints once, rather than per frame
+        source_indices = frame_order.tolist()
+        frame_indices_list = zip(*axis_indices[:, frame_order].tolist())
+
+        debug = self.logger.isEnabledFor(logging.DEBUG)
+        source_name = self.source_file.rsplit("/", 1)[-1]
+
+        # Iterate over total number of row hyperslabs to map to VDS
+        for idx, frame_indices in zip(source_indices, frame_indices_list):
+            # Hyperslab: Single frame, full height and width
+            source_space.select_hyperslab((idx, 0, 0), (1, 1, 1),
+                                          block=source_block)
+            # Hyperslab: Single index for each axis of the target shape,
+            #            Full height and width
+            v_layout.map_hyperslab(frame_indices + (0, 0), frame_block,
+                                   source_file, source_node, source_space)
+
+            if debug:
+                self.logger.debug(
+                    "Mapping %s[%s, ...] to %s[%d, ...].",
+                    self.name, ", ".join(str(i) for i in frame_indices),
+                    source_name, idx)
 
-    def calculate_axis_indices(self, frame_index, radices, shape):
-        """Calculate indices for each inner axis for this frame index.
+        return v_layout
+
+    def calculate_all_axis_indices(self, shape):
+        """Calculate indices for each inner axis for every frame index.
 
         Args:
-            frame_index(int): Frame index in overall dataset
-            radices(tuple): Mixed radix numeral definition
             shape(tuple): Shape of dataset
 
         Returns:
-            list: Indices for each individual axis
+            numpy.ndarray: Indices of every frame for each axis, with shape
+                (axes, frames)
 
         """
-        axis_indices = [0 for _ in self.dimensions]
-        for idx, radix in enumerate(radices):
-            while frame_index >= radix:
-                frame_index -= radix
-                axis_indices[idx] += 1
+        axis_indices = np.stack(np.unravel_index(
+            np.arange(self.target_frames), self.dimensions)).astype(np.int32)
 
         # Invert axis indices for axes that are alternating
         for axis in range(1, len(self.dimensions)):
-            if self.alternate[axis] and axis_indices[axis - 1] % 2 != 0:
-                # If this axis alternates direction and the parent axis index
-                # is odd, then invert this axis index
-                axis_indices[axis] = shape[axis] - 1 - axis_indices[axis]
+            if self.alternate[axis]:
+                # Where the parent axis index is odd, invert this axis index
+                parent_odd = (axis_indices[axis - 1] & 1).astype(bool)
+                axis_indices[axis] = np.where(
+                    parent_odd, shape[axis] - 1 - axis_indices[axis],
+                    axis_indices[axis])
 
         return axis_indices
+
+    @staticmethod
+    def product(iterable):
+        """Calculate product of elements of an iterable.
+
+        Args:
+            iterable: An object capable of returning its members one at a time.
+                Must have at least on element.
+
+        Returns:
+            int: Product
+
+        """
+        return reduce(mul, iterable, 1)
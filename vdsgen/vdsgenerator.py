@@ -140,8 +140,19 @@ class VDSGenerator(object):
         self.logger.info("Creating VDS at %s", self.output_file)
         with h5.File(self.output_file, self.mode, libver="latest") as vds:
             self.validate_node(vds)
-            vds.create_virtual_dataset(self.target_node, virtual_layout,
-                                       fillvalue=self.fill_value)
+            self.create_virtual_dataset(vds, virtual_layout)
+
+    def create_virtual_dataset(self, vds_file, virtual_layout):
+        """Create the virtual dataset at the target node.
+
+        Args:
+            vds_file(h5py.File): File to create dataset in
+            virtual_layout(VirtualLayout): Object describing links between
+                raw data and VDS
+
+        """
+        vds_file.create_virtual_dataset(self.target_node, virtual_layout,
+                                        fillvalue=self.fill_value)
 
     def find_files(self):
         """Find HDF5 files in given folder with given prefix.